@@ -13,6 +13,7 @@ from backtesting import Backtest, Strategy
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from scripts.data_loader import load_data
+from scripts.backtest_utils import stats_to_result
 
 INDICATOR_NAME = "Super Trend + RSI"
 
@@ -60,19 +61,7 @@ def run_backtest(ticker="SPY", cash=100000, commission=0.001):
                   exclusive_orders=True)
     stats = bt.run()
 
-    results = {
-        "indicator_name": INDICATOR_NAME,
-        "ticker": ticker,
-        "return_pct": round(float(stats["Return [%]"]), 2),
-        "buy_hold_return_pct": round(float(stats["Buy & Hold Return [%]"]), 2),
-        "max_drawdown_pct": round(float(stats["Max. Drawdown [%]"]), 2),
-        "num_trades": int(stats["# Trades"]),
-        "win_rate_pct": round(float(stats["Win Rate [%]"]), 2) if stats["# Trades"] > 0 else 0,
-        "profit_factor": round(float(pf), 2) if (pf := stats.get("Profit Factor")) and pf == pf else 0,
-        "sharpe_ratio": round(float(sr), 2) if (sr := stats.get("Sharpe Ratio")) and sr == sr else 0,
-        "start_date": str(stats["Start"]),
-        "end_date": str(stats["End"]),
-    }
+    results = stats_to_result(stats, INDICATOR_NAME, ticker)
 
     print(json.dumps(results))
     return results
@@ -5,6 +5,8 @@ Copy this file to backtests/<indicator_name>.py and fill in:
   1. INDICATOR_NAME - name of the TradingView indicator
   2. MyStrategy.init() - compute indicators using self.I() wrapper
   3. MyStrategy.next() - define buy/sell logic
+  4. (optional) CASH / COMMISSION / YEARS / EXCLUSIVE_ORDERS and
+     prepare_data() - run settings, honoured by every runner
 
 RULES for self.I() wrapper:
   - self.I() takes a FUNCTION and its ARGUMENTS, NOT pre-computed arrays
@@ -43,12 +45,19 @@ from backtesting import Backtest, Strategy
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from scripts.data_loader import load_data
+from scripts.backtest_utils import stats_to_result
 
 # ============================================================
 # FILL IN: Indicator name (must match the TradingView indicator)
 # ============================================================
 INDICATOR_NAME = "TEMPLATE - DO NOT RUN DIRECTLY"
 
+# Run settings (read by both runners; see scripts/backtest_utils.py)
+CASH = 100000
+COMMISSION = 0.001
+YEARS = 2
+EXCLUSIVE_ORDERS = True
+
 
 class MyStrategy(Strategy):
     """
@@ -84,27 +93,20 @@ class MyStrategy(Strategy):
         pass
 
 
-def run_backtest(ticker="SPY", cash=100000, commission=0.001):
+def prepare_data(df):
+    """Transform the loaded OHLCV data before backtesting (default: unchanged)."""
+    return df
+
+
+def run_backtest(ticker="SPY", cash=CASH, commission=COMMISSION):
     """Run the backtest and output results as JSON to stdout."""
-    df = load_data(ticker, years=2)
+    df = prepare_data(load_data(ticker, years=YEARS))
 
     bt = Backtest(df, MyStrategy, cash=cash, commission=commission,
-                  exclusive_orders=True)
+                  exclusive_orders=EXCLUSIVE_ORDERS)
     stats = bt.run()
 
-    results = {
-        "indicator_name": INDICATOR_NAME,
-        "ticker": ticker,
-        "return_pct": round(float(stats["Return [%]"]), 2),
-        "buy_hold_return_pct": round(float(stats["Buy & Hold Return [%]"]), 2),
-        "max_drawdown_pct": round(float(stats["Max. Drawdown [%]"]), 2),
-        "num_trades": int(stats["# Trades"]),
-        "win_rate_pct": round(float(stats["Win Rate [%]"]), 2) if stats["# Trades"] > 0 else 0,
-        "profit_factor": round(float(pf), 2) if (pf := stats.get("Profit Factor")) and pf == pf else 0,
-        "sharpe_ratio": round(float(sr), 2) if (sr := stats.get("Sharpe Ratio")) and sr == sr else 0,
-        "start_date": str(stats["Start"]),
-        "end_date": str(stats["End"]),
-    }
+    results = stats_to_result(stats, INDICATOR_NAME, ticker)
 
     # Output JSON to stdout for the runner to capture
     print(json.dumps(results))
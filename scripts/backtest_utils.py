@@ -0,0 +1,39 @@
+"""
+Helpers shared by backtest scripts and the runners.
+
+Backtest scripts may override DEFAULT_SETTINGS by declaring module constants
+of the same names (CASH, COMMISSION, YEARS, EXCLUSIVE_ORDERS) and may define
+prepare_data(df) to transform the loaded OHLCV frame. run_batch_backtest.py
+reads the same names, so a script gives identical numbers whichever runner
+executes it.
+"""
+
+DEFAULT_SETTINGS = {
+    "CASH": 100000,
+    "COMMISSION": 0.001,
+    "YEARS": 2,
+    "EXCLUSIVE_ORDERS": True,
+}
+
+
+def backtest_settings(module):
+    """Return a loaded backtest script's run settings, falling back to the defaults."""
+    return {name: getattr(module, name, default)
+            for name, default in DEFAULT_SETTINGS.items()}
+
+
+def stats_to_result(stats, indicator_name, ticker):
+    """Convert backtesting.py stats to the result dict the runners record."""
+    return {
+        "indicator_name": indicator_name,
+        "ticker": ticker,
+        "return_pct": round(float(stats["Return [%]"]), 2),
+        "buy_hold_return_pct": round(float(stats["Buy & Hold Return [%]"]), 2),
+        "max_drawdown_pct": round(float(stats["Max. Drawdown [%]"]), 2),
+        "num_trades": int(stats["# Trades"]),
+        "win_rate_pct": round(float(stats["Win Rate [%]"]), 2) if stats["# Trades"] > 0 else 0,
+        "profit_factor": round(float(pf), 2) if (pf := stats.get("Profit Factor")) and pf == pf else 0,
+        "sharpe_ratio": round(float(sr), 2) if (sr := stats.get("Sharpe Ratio")) and sr == sr else 0,
+        "start_date": str(stats["Start"]),
+        "end_date": str(stats["End"]),
+    }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Multi-process check for sweep_queue.py using stub backtest scripts.
+
+Starts a worker, kills it (SIGKILL) in the middle of a job, then drains the
+queue with several more workers and verifies that:
+  - every job ends up done, each recorded by exactly one worker
+  - the killed worker's job was re-leased and finished by someone else
+  - master_results-style CSV has exactly one row per (script, ticker)
+
+Everything lives in a temporary directory; the real results CSV and queue
+are not touched.
+
+Usage:
+    python3 scripts/check_sweep_queue.py [--workers 3]
+"""
+
+import argparse
+import csv
+import os
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.sweep_queue import connect, counts, enqueue
+
+SWEEP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sweep_queue.py")
+TICKERS = ["SPY", "QQQ", "IWM"]
+FAST_SCRIPTS = 4
+LEASE = ["--lease-seconds", "2", "--heartbeat-seconds", "0.5", "--poll-seconds", "0.2"]
+
+STUB = """import json, sys, time
+time.sleep({delay})
+print(json.dumps({{"indicator_name": "{name}", "ticker": sys.argv[1],
+                  "return_pct": 1.0, "num_trades": 1}}))
+"""
+
+
+def start_worker(db, csv_path, worker_id, extra=()):
+    return subprocess.Popen(
+        [sys.executable, SWEEP, "--db", db, "work", "--worker-id", worker_id,
+         "--results", csv_path, *LEASE, *extra],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,  # so the victim's backtest child dies with it
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-process sweep queue check")
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="sweep_check_")
+    db = os.path.join(tmp, "queue.db")
+    csv_path = os.path.join(tmp, "results.csv")
+    failures = []
+
+    try:
+        # The slow job is enqueued first so the victim worker leases it
+        scripts = []
+        for name, delay in [("slow", 3)] + [(f"fast{i}", 0.2) for i in range(FAST_SCRIPTS)]:
+            path = os.path.join(tmp, f"{name}.py")
+            with open(path, "w") as f:
+                f.write(STUB.format(delay=delay, name=name))
+            scripts.append(path)
+
+        conn = connect(db)
+        enqueue(conn, scripts[:1], TICKERS[:1])
+        enqueue(conn, scripts, TICKERS)
+        expected = len(scripts) * len(TICKERS)
+
+        victim = start_worker(db, csv_path, "victim")
+        deadline = time.time() + 30
+        while time.time() < deadline:
+            row = conn.execute("SELECT worker FROM jobs WHERE id = 1").fetchone()
+            if row[0] == "victim":
+                break
+            time.sleep(0.1)
+        time.sleep(0.5)
+        os.killpg(victim.pid, signal.SIGKILL)
+        victim.wait()
+        print("Killed worker 'victim' while it held job 1")
+
+        workers = [start_worker(db, csv_path, f"w{i}", ["--exit-when-empty"])
+                   for i in range(args.workers)]
+        for w in workers:
+            w.wait(timeout=120)
+
+        c = counts(conn)
+        if c != {"done": expected}:
+            failures.append(f"expected {expected} done jobs, got {c}")
+
+        worker, attempts = conn.execute(
+            "SELECT worker, attempts FROM jobs WHERE id = 1").fetchone()
+        if worker == "victim" or attempts != 2:
+            failures.append(f"killed job not re-leased: worker={worker}, "
+                            f"attempts={attempts}")
+
+        with open(csv_path, newline="") as f:
+            rows = list(csv.DictReader(f))
+        keys = [(r["script_file"], r["ticker"]) for r in rows]
+        if len(rows) != expected or len(set(keys)) != expected:
+            failures.append(f"expected {expected} unique CSV rows, got "
+                            f"{len(rows)} rows / {len(set(keys))} unique")
+
+        by_worker = dict(conn.execute(
+            "SELECT worker, COUNT(*) FROM jobs GROUP BY worker").fetchall())
+        print(f"Jobs per worker: {by_worker}")
+        conn.close()
+    except (sqlite3.Error, subprocess.TimeoutExpired, OSError) as e:
+        failures.append(str(e))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}", file=sys.stderr)
+        sys.exit(1)
+    print(f"OK: {expected} jobs, each recorded once; killed worker's job re-leased")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,17 +11,13 @@ from datetime import datetime, timedelta
 CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data_cache")
 
 
-def load_data(ticker="SPY", years=2):
-    """
-    Download daily OHLCV data via yfinance with local CSV caching.
+def _cache_file(ticker, years):
+    return os.path.join(CACHE_DIR, f"{ticker}_{years}y.csv")
 
-    Returns a DataFrame with columns: Open, High, Low, Close, Volume
-    Index is a timezone-naive DatetimeIndex named 'Date'.
-    """
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    cache_file = os.path.join(CACHE_DIR, f"{ticker}_{years}y.csv")
 
-    # Use cache if it exists and is less than 24 hours old
+def _read_cache(ticker, years):
+    """Return the cached DataFrame if it is fresh (< 24h) and usable, else None."""
+    cache_file = _cache_file(ticker, years)
     if os.path.exists(cache_file):
         mtime = os.path.getmtime(cache_file)
         age_hours = (datetime.now().timestamp() - mtime) / 3600
@@ -29,21 +25,14 @@ def load_data(ticker="SPY", years=2):
             df = pd.read_csv(cache_file, index_col="Date", parse_dates=True)
             if len(df) > 100:
                 return df
+    return None
 
-    # Download fresh data
-    end = datetime.now()
-    start = end - timedelta(days=years * 365)
-
-    data = yf.download(ticker, start=start.strftime("%Y-%m-%d"),
-                       end=end.strftime("%Y-%m-%d"), auto_adjust=True)
 
+def _clean(data, ticker, years):
+    """Normalise a single-ticker yfinance frame to OHLCV and cache it."""
     if data.empty:
         raise ValueError(f"No data returned for {ticker}")
 
-    # Handle MultiIndex columns (yfinance sometimes returns multi-level)
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.get_level_values(0)
-
     # Keep only OHLCV
     df = data[["Open", "High", "Low", "Close", "Volume"]].copy()
 
@@ -54,11 +43,79 @@ def load_data(ticker="SPY", years=2):
     df.index.name = "Date"
 
     # Cache to CSV
-    df.to_csv(cache_file)
+    df.to_csv(_cache_file(ticker, years))
 
     return df
 
 
+def load_data(ticker="SPY", years=2):
+    """
+    Download daily OHLCV data via yfinance with local CSV caching.
+
+    Returns a DataFrame with columns: Open, High, Low, Close, Volume
+    Index is a timezone-naive DatetimeIndex named 'Date'.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    # Use cache if it exists and is less than 24 hours old
+    df = _read_cache(ticker, years)
+    if df is not None:
+        return df
+
+    # Download fresh data
+    end = datetime.now()
+    start = end - timedelta(days=years * 365)
+
+    data = yf.download(ticker, start=start.strftime("%Y-%m-%d"),
+                       end=end.strftime("%Y-%m-%d"), auto_adjust=True)
+
+    # Handle MultiIndex columns (yfinance sometimes returns multi-level)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+
+    return _clean(data, ticker, years)
+
+
+def load_many(tickers, years=2):
+    """
+    Load several tickers at once.
+
+    Fresh cache entries are read from disk; everything else is fetched in a
+    single yfinance request instead of one request per ticker.
+
+    Returns {ticker: DataFrame} (same format as load_data). Tickers with no
+    data are left out.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+
+    frames = {}
+    missing = []
+    for ticker in tickers:
+        df = _read_cache(ticker, years)
+        if df is not None:
+            frames[ticker] = df
+        else:
+            missing.append(ticker)
+
+    if missing:
+        end = datetime.now()
+        start = end - timedelta(days=years * 365)
+        data = yf.download(missing, start=start.strftime("%Y-%m-%d"),
+                           end=end.strftime("%Y-%m-%d"), auto_adjust=True,
+                           group_by="ticker")
+        for ticker in missing:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    continue
+                sub = data[ticker].dropna(how="all")
+            else:
+                sub = data.dropna(how="all")
+            if not sub.empty:
+                frames[ticker] = _clean(sub, ticker, years)
+
+    return {t: frames[t] for t in tickers if t in frames}
+
+
 if __name__ == "__main__":
     import sys
     ticker = sys.argv[1] if len(sys.argv) > 1 else "SPY"
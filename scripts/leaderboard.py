@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Live leaderboard for a running sweep.
+
+Tails results/master_results.csv (only the bytes appended since the last
+poll - history is never rescanned) and keeps running aggregates that cost
+O(1) per new result:
+  - best Sharpe / return / profit factor per strategy across tickers
+  - top-K results by Sharpe, return and profit factor
+  - how many results pass the discord_notify.THRESHOLDS gates
+  - throughput and ETA
+
+The view is printed to the terminal and written to results/leaderboard.json
+on every refresh so other tools can read it.
+
+Usage:
+    # Watch new results, ETA from an expected result count
+    python3 scripts/leaderboard.py --total 200
+
+    # Watch a distributed sweep, ETA from the queue
+    python3 scripts/leaderboard.py --queue results/sweep_queue.db
+
+    # Include results already in the CSV, print once and exit
+    python3 scripts/leaderboard.py --from-start --once
+"""
+
+import argparse
+import csv
+import heapq
+import io
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.run_single_backtest import PROJECT_ROOT, RESULTS_CSV
+from scripts.discord_notify import THRESHOLDS, passes_quality_check
+
+SNAPSHOT_FILE = os.path.join(PROJECT_ROOT, "results", "leaderboard.json")
+METRICS = ("sharpe_ratio", "return_pct", "profit_factor")
+NUMERIC_FIELDS = ("return_pct", "buy_hold_return_pct", "max_drawdown_pct",
+                  "num_trades", "win_rate_pct", "profit_factor", "sharpe_ratio")
+REFRESH_SECONDS = 2
+
+
+def _to_number(value):
+    """Parse a CSV cell to float; blanks and junk become NaN."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+class Leaderboard:
+    """Sweep aggregates maintained incrementally, one result at a time."""
+
+    def __init__(self, top_k=10, total=None):
+        self.top_k = top_k
+        self.total = total
+        self.count = 0
+        self.passed = 0
+        self.best = {}                          # strategy -> {metric: entry}
+        self.top = {m: [] for m in METRICS}     # metric -> min-heap of entries
+        self._seq = 0                           # heap tie-breaker
+        self.start_clock()
+
+    def start_clock(self):
+        """Measure throughput from now (e.g. after loading history)."""
+        self.started = time.time()
+        self.live_count = 0
+
+    def update(self, row):
+        """Fold one result row (CSV dict or runner JSON) into the aggregates."""
+        result = dict(row)
+        for field in NUMERIC_FIELDS:
+            result[field] = _to_number(result.get(field))
+
+        self.count += 1
+        self.live_count += 1
+        if passes_quality_check(result)[0]:
+            self.passed += 1
+
+        name = result.get("indicator_name", "unknown")
+        bests = self.best.setdefault(name, {})
+        for metric in METRICS:
+            value = result[metric]
+            if value != value:  # NaN never ranks
+                continue
+            entry = {
+                "value": value,
+                "indicator_name": name,
+                "ticker": result.get("ticker", ""),
+                "script_file": result.get("script_file", ""),
+            }
+            if metric not in bests or value > bests[metric]["value"]:
+                bests[metric] = entry
+
+            # Bounded heap: O(log K) with K fixed, i.e. O(1) per result
+            self._seq += 1
+            item = (value, self._seq, entry)
+            heap = self.top[metric]
+            if len(heap) < self.top_k:
+                heapq.heappush(heap, item)
+            elif value > heap[0][0]:
+                heapq.heapreplace(heap, item)
+
+    def snapshot(self, remaining=None):
+        """Return the current state as a JSON-serialisable dict."""
+        elapsed = time.time() - self.started
+        rate = self.live_count / elapsed if elapsed > 0 else 0.0
+        if remaining is None and self.total is not None:
+            remaining = max(self.total - self.live_count, 0)
+        eta = remaining / rate if remaining is not None and rate > 0 else None
+
+        return {
+            "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "results": self.count,
+            "passed_thresholds": self.passed,
+            "thresholds": THRESHOLDS,
+            "throughput_per_min": round(rate * 60, 2),
+            "remaining": remaining,
+            "eta_seconds": round(eta) if eta is not None else None,
+            "top": {
+                metric: [entry for _, _, entry in sorted(heap, reverse=True)]
+                for metric, heap in self.top.items()
+            },
+            "best_per_strategy": self.best,
+        }
+
+    def render(self, snap):
+        """Format a snapshot for the terminal."""
+        eta = snap["eta_seconds"]
+        lines = [
+            f"Sweep leaderboard  |  {snap['updated']}",
+            f"  Results: {snap['results']}  |  "
+            f"Passed thresholds: {snap['passed_thresholds']}  |  "
+            f"Throughput: {snap['throughput_per_min']}/min  |  "
+            f"Remaining: {snap['remaining'] if snap['remaining'] is not None else '?'}  |  "
+            f"ETA: {time.strftime('%H:%M:%S', time.gmtime(eta)) if eta is not None else '?'}",
+        ]
+        for metric, entries in snap["top"].items():
+            lines.append("")
+            lines.append(f"Top {self.top_k} by {metric}:")
+            for i, e in enumerate(entries, 1):
+                lines.append(f"  {i:>2}. {e['value']:>9.2f}  {e['ticker']:<6} "
+                             f"{e['indicator_name']}")
+        return "\n".join(lines)
+
+
+def tail_csv(path, offset=0, header=None):
+    """
+    Read rows appended to path since byte offset.
+
+    Returns (rows, new_offset, header). A trailing partial line (writer
+    mid-append) is left for the next call.
+    """
+    if not os.path.exists(path):
+        return [], offset, header
+    with open(path, "rb") as f:
+        if header is None:
+            first = f.readline()
+            if not first.endswith(b"\n"):
+                return [], offset, header
+            header = next(csv.reader([first.decode()]))
+            offset = max(offset, f.tell())
+        f.seek(offset)
+        chunk = f.read()
+
+    end = chunk.rfind(b"\n") + 1
+    if end == 0:
+        return [], offset, header
+    reader = csv.DictReader(io.StringIO(chunk[:end].decode()), fieldnames=header)
+    return list(reader), offset + end, header
+
+
+def write_snapshot(snap, path=SNAPSHOT_FILE):
+    """Write the snapshot atomically so readers never see a partial file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(snap, f, indent=2)
+    os.replace(tmp, path)
+
+
+def queue_remaining(db_path):
+    """
+    Pending + running jobs in a sweep_queue database.
+
+    Returns None (unknown) until the coordinator has enqueued jobs - the
+    file, the table or any rows may not exist yet. The database is opened
+    read-only so no empty file is left behind.
+    """
+    if not os.path.exists(db_path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro",
+                               uri=True, timeout=30)
+    except sqlite3.OperationalError:
+        return None
+    try:
+        total, remaining = conn.execute(
+            "SELECT COUNT(*), "
+            "COALESCE(SUM(status IN ('pending', 'running')), 0) FROM jobs"
+        ).fetchone()
+        # connect() creates an empty jobs table (e.g. via status or an idle
+        # worker), so an empty queue means "not enqueued yet", not "done"
+        return remaining if total else None
+    except sqlite3.OperationalError:
+        # No jobs table until the coordinator has enqueued
+        return None
+    finally:
+        conn.close()
+
+
+def watch(csv_path=RESULTS_CSV, snapshot_path=SNAPSHOT_FILE, top_k=10,
+          total=None, queue_db=None, from_start=False, once=False,
+          interval=REFRESH_SECONDS):
+    """Poll the results CSV and refresh the view until interrupted."""
+    board = Leaderboard(top_k=top_k, total=total)
+    header = None
+    offset = 0
+
+    if from_start:
+        rows, offset, header = tail_csv(csv_path, 0, None)
+        for row in rows:
+            board.update(row)
+        board.start_clock()
+    elif os.path.exists(csv_path):
+        # Skip history: read only the header line, then start at the end
+        with open(csv_path, "rb") as f:
+            first = f.readline()
+            offset = f.seek(0, os.SEEK_END)
+        if first.endswith(b"\n"):
+            header = next(csv.reader([first.decode()]))
+        else:
+            offset = 0
+
+    while True:
+        # Queue first, CSV second: a worker appends its row before marking
+        # the job done, so every job counted as finished here is already in
+        # the CSV we are about to read.
+        remaining = queue_remaining(queue_db) if queue_db else None
+        rows, offset, header = tail_csv(csv_path, offset, header)
+        for row in rows:
+            board.update(row)
+
+        snap = board.snapshot(remaining)
+        write_snapshot(snap, snapshot_path)
+
+        if once:
+            print(board.render(snap))
+            return snap
+        print("\033[H\033[2J" + board.render(snap), flush=True)
+        if snap["remaining"] == 0:
+            return snap
+        time.sleep(interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Live sweep leaderboard")
+    parser.add_argument("--csv", default=RESULTS_CSV, help="results CSV to tail")
+    parser.add_argument("--snapshot", default=SNAPSHOT_FILE,
+                        help="JSON snapshot output path")
+    parser.add_argument("--top", type=int, default=10, help="entries per top-K list")
+    parser.add_argument("--total", type=int, default=None,
+                        help="expected number of new results (for ETA)")
+    parser.add_argument("--queue", default=None,
+                        help="sweep_queue.db to take remaining jobs from")
+    parser.add_argument("--from-start", action="store_true",
+                        help="fold in results already in the CSV")
+    parser.add_argument("--once", action="store_true", help="print once and exit")
+    parser.add_argument("--interval", type=float, default=REFRESH_SECONDS)
+    args = parser.parse_args()
+
+    try:
+        watch(args.csv, args.snapshot, args.top, args.total, args.queue,
+              args.from_start, args.once, args.interval)
+    except KeyboardInterrupt:
+        pass
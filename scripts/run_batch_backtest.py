@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Run one backtest script on many tickers in a single process and record the
+results to master_results.csv.
+
+Unlike run_single_backtest.py (one subprocess per ticker), the strategy
+module is imported once, all price series are loaded in one shot via
+data_loader.load_many, and only the simulation itself runs per ticker.
+The script's run settings (CASH, COMMISSION, YEARS, EXCLUSIVE_ORDERS,
+prepare_data - see backtest_utils.py) are honoured, so results match
+run_single_backtest.py. Each ticker gets the same TIMEOUT as a single run
+and its row is written as soon as it finishes.
+
+Usage:
+    python3 scripts/run_batch_backtest.py backtests/my_strategy.py SPY QQQ
+    python3 scripts/run_batch_backtest.py backtests/my_strategy.py --file tickers.txt
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import os
+import signal
+import sys
+import threading
+
+from backtesting import Backtest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.backtest_utils import backtest_settings, stats_to_result
+from scripts.data_loader import load_many
+from scripts.run_single_backtest import (PROJECT_ROOT, TIMEOUT, append_result,
+                                         log_error, print_summary)
+
+
+def load_strategy(script_path):
+    """Import a backtest script as a module (without running its __main__)."""
+    name = os.path.splitext(os.path.basename(script_path))[0]
+    spec = importlib.util.spec_from_file_location(f"backtests.{name}", script_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """Raise TimeoutError if the block runs longer than seconds (Unix only)."""
+    if not hasattr(signal, "SIGALRM") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def _expired(signum, frame):
+        raise TimeoutError(f"Timeout after {seconds}s")
+
+    previous = signal.signal(signal.SIGALRM, _expired)
+    signal.alarm(seconds)
+    try:
+        yield
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_batch(script_path, tickers):
+    """Run script_path's MyStrategy on every ticker and record the results."""
+    script_path = os.path.abspath(script_path)
+
+    if not os.path.exists(script_path):
+        error = f"Script not found: {script_path}"
+        log_error(script_path, ",".join(tickers), error)
+        print(f"ERROR: {error}", file=sys.stderr)
+        return []
+
+    try:
+        module = load_strategy(script_path)
+        settings = backtest_settings(module)
+        frames = load_many(tickers, years=settings["YEARS"])
+    except Exception as e:
+        error = str(e)
+        log_error(script_path, ",".join(tickers), error)
+        print(f"ERROR: {error}", file=sys.stderr)
+        return []
+
+    indicator_name = getattr(module, "INDICATOR_NAME", "unknown")
+    prepare_data = getattr(module, "prepare_data", None)
+    print(f"Running: {os.path.basename(script_path)} on {len(tickers)} tickers...")
+
+    results = []
+    for ticker in tickers:
+        if ticker not in frames:
+            error = f"No data returned for {ticker}"
+            log_error(script_path, ticker, error)
+            print(f"FAILED: {ticker}: {error}", file=sys.stderr)
+            continue
+        try:
+            with time_limit(TIMEOUT):
+                df = frames[ticker]
+                if prepare_data is not None:
+                    df = prepare_data(df)
+                bt = Backtest(df, module.MyStrategy, cash=settings["CASH"],
+                              commission=settings["COMMISSION"],
+                              exclusive_orders=settings["EXCLUSIVE_ORDERS"])
+                stats = bt.run()
+        except TimeoutError as e:
+            error = str(e)
+            log_error(script_path, ticker, error)
+            print(f"TIMEOUT: {ticker}: {error}", file=sys.stderr)
+            continue
+        except Exception as e:
+            error = str(e)
+            log_error(script_path, ticker, error)
+            print(f"FAILED: {ticker}: {error}", file=sys.stderr)
+            continue
+
+        result = stats_to_result(stats, indicator_name, ticker)
+        row = append_result(result, script_path)
+        print(f"{ticker}:")
+        print_summary(row)
+        results.append(result)
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run one backtest on many tickers")
+    parser.add_argument("script", help="backtest script, e.g. backtests/my_strategy.py")
+    parser.add_argument("tickers", nargs="*", help="tickers (default: SPY QQQ)")
+    parser.add_argument("--file", help="file with one ticker per line")
+    args = parser.parse_args()
+
+    tickers = [t.upper() for t in args.tickers]
+    if args.file:
+        with open(args.file) as f:
+            tickers += [line.strip().upper() for line in f
+                        if line.strip() and not line.startswith("#")]
+    tickers = list(dict.fromkeys(tickers)) or ["SPY", "QQQ"]
+
+    script = os.path.abspath(args.script)
+    os.chdir(PROJECT_ROOT)
+    results = run_batch(script, tickers)
+
+    if not results:
+        sys.exit(1)
@@ -10,6 +10,7 @@ Usage:
 import subprocess
 import sys
 import os
+import time
 import json
 import csv
 from datetime import datetime
@@ -18,6 +19,11 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 RESULTS_CSV = os.path.join(PROJECT_ROOT, "results", "master_results.csv")
 ERROR_LOG = os.path.join(PROJECT_ROOT, "logs", "errors.log")
 TIMEOUT = 120  # seconds
+CANCEL_POLL = 1  # seconds between checks of a cancel event
+
+
+class Cancelled(Exception):
+    """Raised when a running backtest is cancelled by its caller."""
 
 
 def log_error(script_path, ticker, error_msg):
@@ -27,8 +33,9 @@ def log_error(script_path, ticker, error_msg):
         f.write(f"[{ts}] {script_path} | {ticker} | {error_msg}\n")
 
 
-def append_result(result, script_path):
+def append_result(result, script_path, results_csv=None):
     """Append a result dict to master_results.csv."""
+    results_csv = results_csv or RESULTS_CSV
     ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     row = {
         "indicator_name": result.get("indicator_name", "unknown"),
@@ -46,8 +53,8 @@ def append_result(result, script_path):
         "timestamp": ts,
     }
 
-    file_exists = os.path.exists(RESULTS_CSV) and os.path.getsize(RESULTS_CSV) > 0
-    with open(RESULTS_CSV, "a", newline="") as f:
+    file_exists = os.path.exists(results_csv) and os.path.getsize(results_csv) > 0
+    with open(results_csv, "a", newline="") as f:
         writer = csv.DictWriter(f, fieldnames=row.keys())
         if not file_exists:
             writer.writeheader()
@@ -56,32 +63,71 @@ def append_result(result, script_path):
     return row
 
 
-def run_backtest(script_path, ticker="SPY"):
-    """Execute a backtest script and capture its JSON output."""
+def print_summary(row):
+    """Print the one-line summary for a recorded result row."""
+    print(f"  Return: {row['return_pct']}%  |  "
+          f"B&H: {row['buy_hold_return_pct']}%  |  "
+          f"MaxDD: {row['max_drawdown_pct']}%  |  "
+          f"Trades: {row['num_trades']}  |  "
+          f"WinRate: {row['win_rate_pct']}%  |  "
+          f"PF: {row['profit_factor']}  |  "
+          f"Sharpe: {row['sharpe_ratio']}")
+
+
+def _run_script(cmd, cancel=None):
+    """
+    subprocess.run(cmd) with TIMEOUT, killing the child early if the
+    optional threading.Event cancel gets set.
+    """
+    if cancel is None:
+        return subprocess.run(cmd, capture_output=True, text=True,
+                              timeout=TIMEOUT, cwd=PROJECT_ROOT)
+
+    deadline = time.time() + TIMEOUT
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            text=True, cwd=PROJECT_ROOT)
+    while True:
+        try:
+            stdout, stderr = proc.communicate(timeout=CANCEL_POLL)
+            return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+        except subprocess.TimeoutExpired:
+            if cancel.is_set():
+                proc.kill()
+                proc.communicate()
+                raise Cancelled()
+            if time.time() >= deadline:
+                proc.kill()
+                proc.communicate()
+                raise subprocess.TimeoutExpired(cmd, TIMEOUT)
+
+
+def execute_backtest(script_path, ticker="SPY", cancel=None):
+    """
+    Execute a backtest script and capture its JSON output.
+
+    Nothing is written to master_results.csv; errors are logged. If cancel
+    (a threading.Event) is set while the script runs, the child process is
+    killed and (None, "Cancelled") is returned without logging an error.
+    Returns (result_dict, None) on success or (None, error_message).
+    """
     script_path = os.path.abspath(script_path)
 
     if not os.path.exists(script_path):
         error = f"Script not found: {script_path}"
         log_error(script_path, ticker, error)
         print(f"ERROR: {error}", file=sys.stderr)
-        return None
+        return None, error
 
     print(f"Running: {os.path.basename(script_path)} on {ticker}...")
 
     try:
-        result = subprocess.run(
-            [sys.executable, script_path, ticker],
-            capture_output=True,
-            text=True,
-            timeout=TIMEOUT,
-            cwd=PROJECT_ROOT,
-        )
+        result = _run_script([sys.executable, script_path, ticker], cancel)
 
         if result.returncode != 0:
             error = result.stderr.strip()[-500:] if result.stderr else "Unknown error"
             log_error(script_path, ticker, error)
             print(f"FAILED: {error}", file=sys.stderr)
-            return None
+            return None, error
 
         # Parse JSON from the last line of stdout
         stdout_lines = result.stdout.strip().split("\n")
@@ -96,38 +142,44 @@ def run_backtest(script_path, ticker="SPY"):
             error = f"No JSON output found. stdout: {result.stdout[:300]}"
             log_error(script_path, ticker, error)
             print(f"FAILED: {error}", file=sys.stderr)
-            return None
+            return None, error
 
-        data = json.loads(json_line)
-        row = append_result(data, script_path)
-
-        # Print summary
-        print(f"  Return: {row['return_pct']}%  |  "
-              f"B&H: {row['buy_hold_return_pct']}%  |  "
-              f"MaxDD: {row['max_drawdown_pct']}%  |  "
-              f"Trades: {row['num_trades']}  |  "
-              f"WinRate: {row['win_rate_pct']}%  |  "
-              f"PF: {row['profit_factor']}  |  "
-              f"Sharpe: {row['sharpe_ratio']}")
-
-        return data
+        return json.loads(json_line), None
 
+    except Cancelled:
+        print(f"CANCELLED: {os.path.basename(script_path)} on {ticker}",
+              file=sys.stderr)
+        return None, "Cancelled"
     except subprocess.TimeoutExpired:
         error = f"Timeout after {TIMEOUT}s"
         log_error(script_path, ticker, error)
         print(f"TIMEOUT: {error}", file=sys.stderr)
-        return None
+        return None, error
     except json.JSONDecodeError as e:
         error = f"JSON parse error: {e}"
         log_error(script_path, ticker, error)
         print(f"FAILED: {error}", file=sys.stderr)
-        return None
+        return None, error
     except Exception as e:
         error = str(e)
         log_error(script_path, ticker, error)
         print(f"ERROR: {error}", file=sys.stderr)
+        return None, error
+
+
+def run_backtest(script_path, ticker="SPY"):
+    """Execute a backtest script and record its result to master_results.csv."""
+    data, _ = execute_backtest(script_path, ticker)
+    if data is None:
         return None
 
+    row = append_result(data, script_path)
+
+    # Print summary
+    print_summary(row)
+
+    return data
+
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Distribute a backtest sweep across any number of worker processes/nodes
+through a shared SQLite job queue.
+
+The coordinator enqueues one job per (script, ticker). Workers lease jobs,
+keep the lease alive with a heartbeat while the backtest runs, and record the
+result both in the queue and in results/master_results.csv. A job whose
+worker stops heartbeating (crash, node lost) is handed to the next worker
+once its lease expires; a run that fails (download error, timeout) goes back
+to pending. Either way a job gets MAX_ATTEMPTS tries before it is marked
+failed. A worker that has lost its lease kills its backtest, and the CSV
+row is written under the same write lock that marks the job done, so every
+job lands in the CSV once.
+
+Put the queue file on storage every node can reach (NFS/SMB mount of the
+project directory) and start as many workers as you like - on one machine
+or many. Worker clocks should be roughly in sync (NTP), since lease expiry
+is compared against wall-clock time.
+
+Usage:
+    # Coordinator: enqueue every backtest on SPY and QQQ
+    python3 scripts/sweep_queue.py enqueue backtests/*.py --tickers SPY QQQ
+
+    # Worker (run one per core, on as many nodes as you like)
+    python3 scripts/sweep_queue.py work
+
+    # Progress (and reasons for failed jobs)
+    python3 scripts/sweep_queue.py status
+
+    # Give failed jobs another MAX_ATTEMPTS tries
+    python3 scripts/sweep_queue.py requeue
+"""
+
+import argparse
+import glob
+import json
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.run_single_backtest import (PROJECT_ROOT, append_result,
+                                         execute_backtest, print_summary)
+
+QUEUE_DB = os.path.join(PROJECT_ROOT, "results", "sweep_queue.db")
+LEASE_SECONDS = 60       # lease is lost if not renewed within this window
+HEARTBEAT_SECONDS = 15   # how often a busy worker renews its lease
+POLL_SECONDS = 5         # idle worker sleep between empty polls
+MAX_ATTEMPTS = 3         # give up on a job after this many leases (2 retries)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            INTEGER PRIMARY KEY AUTOINCREMENT,
+    script        TEXT NOT NULL,
+    ticker        TEXT NOT NULL,
+    status        TEXT NOT NULL DEFAULT 'pending',
+    worker        TEXT,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    lease_expires REAL,
+    result        TEXT,
+    created_at    REAL NOT NULL,
+    finished_at   REAL,
+    UNIQUE (script, ticker)
+)
+"""
+
+
+def connect(db_path=QUEUE_DB):
+    """Open the queue database, creating the schema if needed."""
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    # isolation_level=None: we issue BEGIN IMMEDIATE ourselves so that
+    # leasing a job is a single write-locked transaction across processes.
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.execute(SCHEMA)
+    return conn
+
+
+def enqueue(conn, scripts, tickers):
+    """Add one pending job per (script, ticker). Existing pairs are skipped."""
+    now = time.time()
+    added = 0
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for script in scripts:
+            # Stored relative to the project root so nodes may mount it anywhere
+            rel = os.path.relpath(os.path.abspath(script), PROJECT_ROOT)
+            for ticker in tickers:
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO jobs (script, ticker, created_at) "
+                    "VALUES (?, ?, ?)",
+                    (rel, ticker.upper(), now),
+                )
+                added += cur.rowcount
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return added
+
+
+def lease_job(conn, worker_id, lease_seconds=LEASE_SECONDS):
+    """
+    Atomically claim the next runnable job for worker_id.
+
+    Runnable means pending, or running with an expired lease (dead worker).
+    Returns (job_id, script, ticker) or None if nothing is runnable.
+    """
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Jobs from dead workers that have used up their attempts are failed
+        conn.execute(
+            "UPDATE jobs SET status = 'failed', finished_at = ?, "
+            "result = 'lease expired after max attempts' "
+            "WHERE status = 'running' AND lease_expires < ? AND attempts >= ?",
+            (now, now, MAX_ATTEMPTS),
+        )
+        row = conn.execute(
+            "SELECT id, script, ticker FROM jobs "
+            "WHERE status = 'pending' "
+            "   OR (status = 'running' AND lease_expires < ?) "
+            "ORDER BY id LIMIT 1",
+            (now,),
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE jobs SET status = 'running', worker = ?, "
+            "attempts = attempts + 1, lease_expires = ? WHERE id = ?",
+            (worker_id, now + lease_seconds, row[0]),
+        )
+        conn.execute("COMMIT")
+        return row
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def renew_lease(conn, job_id, worker_id, lease_seconds=LEASE_SECONDS):
+    """Extend the lease. Returns False if the job is no longer ours."""
+    cur = conn.execute(
+        "UPDATE jobs SET lease_expires = ? "
+        "WHERE id = ? AND worker = ? AND status = 'running'",
+        (time.time() + lease_seconds, job_id, worker_id),
+    )
+    return cur.rowcount == 1
+
+
+def finish_job(conn, job_id, worker_id, script, result, error=None,
+               results_csv=None):
+    """
+    Record the outcome of a leased job.
+
+    On success the row is appended to master_results.csv inside the same
+    write transaction that marks the job done, and only if this worker
+    still holds the lease - a job re-leased to another worker is never
+    recorded twice. Once the row is in the CSV the commit is retried until
+    it succeeds (see _commit_recorded) rather than rolled back, so the job
+    cannot be re-run and recorded again. A failed run goes back to pending
+    until it has used MAX_ATTEMPTS, then stays failed; the error text is
+    kept in `result`.
+
+    Returns the recorded CSV row (success), the new status string
+    ('pending' or 'failed'), or None if the lease had been lost.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if result is None:
+            cur = conn.execute(
+                "UPDATE jobs SET "
+                "status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                "finished_at = CASE WHEN attempts < ? THEN NULL ELSE ? END, "
+                "result = ?, lease_expires = NULL "
+                "WHERE id = ? AND worker = ? AND status = 'running'",
+                (MAX_ATTEMPTS, MAX_ATTEMPTS, time.time(), error or "unknown error",
+                 job_id, worker_id),
+            )
+            outcome = None
+            if cur.rowcount == 1:
+                outcome = conn.execute("SELECT status FROM jobs WHERE id = ?",
+                                       (job_id,)).fetchone()[0]
+            conn.execute("COMMIT")
+            return outcome
+
+        cur = conn.execute(
+            "UPDATE jobs SET status = 'done', result = ?, finished_at = ?, "
+            "lease_expires = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (json.dumps(result), time.time(), job_id, worker_id),
+        )
+        if cur.rowcount != 1:
+            conn.execute("COMMIT")
+            return None
+        row = append_result(result, script, results_csv)
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+    _commit_recorded(conn, job_id, worker_id, result)
+    return row
+
+
+def _commit_recorded(conn, job_id, worker_id, result):
+    """
+    Commit a done mark whose CSV row has already been written.
+
+    A busy COMMIT leaves the transaction - and its write lock - in place,
+    so no other worker can lease the job while we retry. If SQLite rolled
+    the transaction back instead, the done mark is re-applied in a new one.
+    """
+    while True:
+        try:
+            if not conn.in_transaction:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute(
+                    "UPDATE jobs SET status = 'done', result = ?, finished_at = ?, "
+                    "lease_expires = NULL WHERE id = ? AND worker = ?",
+                    (json.dumps(result), time.time(), job_id, worker_id),
+                )
+            conn.execute("COMMIT")
+            return
+        except sqlite3.OperationalError as e:
+            print(f"Worker {worker_id}: recording job {job_id} failed ({e}), "
+                  f"retrying", file=sys.stderr)
+            time.sleep(1)
+
+
+def requeue_failed(conn):
+    """Send every failed job back to pending with a fresh attempt budget."""
+    cur = conn.execute(
+        "UPDATE jobs SET status = 'pending', attempts = 0, worker = NULL, "
+        "lease_expires = NULL, finished_at = NULL WHERE status = 'failed'"
+    )
+    return cur.rowcount
+
+
+def _heartbeat(db_path, job_id, worker_id, stop, lost,
+               heartbeat_seconds=HEARTBEAT_SECONDS, lease_seconds=LEASE_SECONDS):
+    """
+    Renew the lease every heartbeat_seconds until stop is set.
+
+    Database errors (e.g. a lock held past the timeout) are reported and
+    retried on the next beat. If the lease turns out to belong to someone
+    else, lost is set (which cancels the running backtest) and the
+    heartbeat ends.
+    """
+    conn = None
+    try:
+        while not stop.wait(heartbeat_seconds):
+            try:
+                conn = conn or connect(db_path)
+                if not renew_lease(conn, job_id, worker_id, lease_seconds):
+                    print(f"Worker {worker_id}: lost lease on job {job_id}",
+                          file=sys.stderr)
+                    lost.set()
+                    return
+            except sqlite3.Error as e:
+                print(f"Worker {worker_id}: heartbeat for job {job_id} failed "
+                      f"({e}), retrying", file=sys.stderr)
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def work(db_path=QUEUE_DB, worker_id=None, exit_when_empty=False,
+         lease_seconds=LEASE_SECONDS, heartbeat_seconds=HEARTBEAT_SECONDS,
+         poll_seconds=POLL_SECONDS, results_csv=None):
+    """Lease and run jobs until the queue is drained (or forever)."""
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    conn = connect(db_path)
+    print(f"Worker {worker_id} started on {db_path}")
+
+    while True:
+        job = lease_job(conn, worker_id, lease_seconds)
+        if job is None:
+            if exit_when_empty and not counts(conn).get("running"):
+                print(f"Worker {worker_id}: queue drained, exiting")
+                break
+            time.sleep(poll_seconds)
+            continue
+
+        job_id, script, ticker = job
+        stop = threading.Event()
+        lost = threading.Event()
+        beat = threading.Thread(
+            target=_heartbeat,
+            args=(db_path, job_id, worker_id, stop, lost,
+                  heartbeat_seconds, lease_seconds),
+            daemon=True,
+        )
+        beat.start()
+        try:
+            # A lost lease kills the backtest instead of waiting it out
+            result, error = execute_backtest(os.path.join(PROJECT_ROOT, script),
+                                             ticker, cancel=lost)
+        finally:
+            stop.set()
+            beat.join()
+
+        if lost.is_set():
+            print(f"Worker {worker_id}: cancelled job {job_id} "
+                  f"({script} {ticker}), re-leased to another worker")
+            continue
+
+        outcome = finish_job(conn, job_id, worker_id, script, result, error,
+                             results_csv)
+        if outcome is None:
+            print(f"Worker {worker_id}: discarding result of job {job_id} "
+                  f"({script} {ticker}), lease expired")
+        elif isinstance(outcome, dict):
+            print_summary(outcome)
+        elif outcome == "pending":
+            print(f"Worker {worker_id}: job {job_id} failed, re-queued")
+
+    conn.close()
+
+
+def counts(conn):
+    """Return {status: count} for the queue."""
+    return dict(conn.execute(
+        "SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=QUEUE_DB, help="queue database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_enqueue = sub.add_parser("enqueue", help="add (script, ticker) jobs")
+    p_enqueue.add_argument("scripts", nargs="+", help="backtest scripts or globs")
+    p_enqueue.add_argument("--tickers", nargs="+", default=["SPY", "QQQ"])
+
+    p_work = sub.add_parser("work", help="lease and run jobs")
+    p_work.add_argument("--worker-id", default=None)
+    p_work.add_argument("--exit-when-empty", action="store_true",
+                        help="stop once no jobs are pending or running")
+    p_work.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    p_work.add_argument("--heartbeat-seconds", type=float, default=HEARTBEAT_SECONDS)
+    p_work.add_argument("--poll-seconds", type=float, default=POLL_SECONDS)
+    p_work.add_argument("--results", default=None,
+                        help="results CSV (default: results/master_results.csv)")
+
+    sub.add_parser("status", help="show job counts and failed jobs")
+    sub.add_parser("requeue", help="send failed jobs back to pending")
+
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        scripts = []
+        for pattern in args.scripts:
+            scripts.extend(sorted(glob.glob(pattern)) or [pattern])
+        conn = connect(args.db)
+        added = enqueue(conn, scripts, args.tickers)
+        print(f"Enqueued {added} new jobs ({len(scripts)} scripts x "
+              f"{len(args.tickers)} tickers)")
+    elif args.command == "work":
+        work(args.db, args.worker_id, args.exit_when_empty, args.lease_seconds,
+             args.heartbeat_seconds, args.poll_seconds, args.results)
+    elif args.command == "status":
+        conn = connect(args.db)
+        c = counts(conn)
+        total = sum(c.values())
+        print("  ".join(f"{k}: {c.get(k, 0)}"
+                        for k in ("pending", "running", "done", "failed"))
+              + f"  |  total: {total}")
+        for script, ticker, error in conn.execute(
+                "SELECT script, ticker, result FROM jobs WHERE status = 'failed'"):
+            print(f"  FAILED {script} {ticker}: {error}")
+    elif args.command == "requeue":
+        conn = connect(args.db)
+        print(f"Re-queued {requeue_failed(conn)} failed jobs")
+
+
+if __name__ == "__main__":
+    main()